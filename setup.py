@@ -37,4 +37,8 @@ setup(
     keywords=['SharePoint'],
     packages=['shareplum'],
     install_requires=['lxml', 'requests', 'requests-ntlm', 'requests-toolbelt'],
+    extras_require={
+        'async': ['aiohttp'],
+        'http2': ['httpx[http2]'],
+    },
 )
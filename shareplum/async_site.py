@@ -0,0 +1,143 @@
+import asyncio
+import io
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import aiohttp
+from lxml import etree
+
+from .errors import ShareplumRequestError
+from .list import _List2007
+from .site import _POOL_MAXSIZE, _SERVICES_URL, _parse_list_collection, _parse_users, _template_id
+from .soap import SOAP_ACTION_PREFIX, Soap, _ServiceContext, _build_soap, _soap_headers, _xml_parser
+from .version import __version__
+
+
+class AsyncSite:
+    """asyncio version of the SharePoint SOAP Site methods
+       Requests share one aiohttp session so calls can run concurrently:
+
+           async with AsyncSite(SITE, authcookie=authcookie) as site:
+               schemas = await site.get_many_lists(["Tasks", "Issues"])
+
+       auth must be an aiohttp.BasicAuth; use authcookie for Office 365.
+    """
+
+    def __init__(self,
+                 site_url,  # type: str
+                 auth=None,  # type: Optional[aiohttp.BasicAuth]
+                 authcookie=None,  # type: Optional[Any]
+                 verify_ssl=True,  # type: bool
+                 huge_tree=False,  # type: bool
+                 timeout=None):  # type: Optional[int]
+        # type: (...) -> None
+        self.site_url = site_url
+        self._verify_ssl = verify_ssl
+        self._auth = auth
+        self._authcookie = authcookie
+        self.huge_tree = huge_tree
+        self._parser = _xml_parser(huge_tree)
+        self.timeout = timeout
+        self.last_request = None  # type: Optional[bytes]
+        self._svc = {
+            name: _ServiceContext(site_url + path, SOAP_ACTION_PREFIX)
+            for name, path in _SERVICES_URL.items()
+        }  # type: Dict[str, _ServiceContext]
+        # aiohttp wants its session created inside the running loop
+        self._session = None  # type: Optional[aiohttp.ClientSession]
+
+    async def __aenter__(self):
+        # type: () -> AsyncSite
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # type: (Any) -> None
+        await self.close()
+
+    async def close(self):
+        # type: () -> None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # type: () -> aiohttp.ClientSession
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=_POOL_MAXSIZE,
+                                             ttl_dns_cache=300,
+                                             ssl=None if self._verify_ssl else False)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  auth=self._auth,
+                                                  cookies=self._authcookie,
+                                                  headers={"user-agent": "shareplum/%s" % __version__},
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def _post(self, service, soap_action, body):
+        # type: (str, str, bytes) -> bytes
+        self.last_request = body
+        service_context = self._svc[service]
+        try:
+            async with self._get_session().post(service_context.url,
+                                                headers=_soap_headers(soap_action,
+                                                                      service_context.soap_action_prefix),
+                                                data=body) as response:
+                response.raise_for_status()
+                return await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise ShareplumRequestError("Shareplum HTTP Post Failed", err)
+
+    async def add_list(self, list_name, description, template_id):
+        # type: (str, str, Any) -> str
+        """Create a new List
+           See Site.add_list for the available templates
+        """
+        body = _build_soap("AddList",
+                           listName=list_name,
+                           description=description,
+                           templateID=_template_id(template_id))
+        content = await self._post("Lists", "AddList", body)
+        return content.decode("utf-8")
+
+    async def delete_list(self, list_name):
+        # type: (str) -> str
+        """Delete a List with given name"""
+        body = _build_soap("DeleteList", listName=list_name)
+        content = await self._post("Lists", "DeleteList", body)
+        return content.decode("utf-8")
+
+    async def get_list_collection(self):
+        # type: () -> List[Dict[str, str]]
+        """Returns List information for current Site"""
+        body = _build_soap("GetListCollection")
+        content = await self._post("SiteData", "GetListCollection", body)
+        return _parse_list_collection(etree.fromstring(content, self._parser))
+
+    async def get_users(self, rowlimit=0):
+        # type: (int) -> Dict[str, Dict[str, str]]
+        """Get users of the current Site
+           rowlimit defaulted to 0 (no limit)
+        """
+        body = _build_soap("GetListItems", listName="UserInfo", rowLimit=str(rowlimit))
+        content = await self._post("Lists", "GetListItems", body)
+        return _parse_users(io.BytesIO(content), self.huge_tree)
+
+    async def get_list(self, list_name):
+        # type: (str) -> Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, str]]
+        """Get the fields, regional settings and server settings of a List"""
+        soap_request = Soap("GetList")
+        soap_request.add_parameter("listName", list_name)
+
+        content = await self._post("Lists", "GetList", str(soap_request).encode("utf-8"))
+        envelope = etree.fromstring(content, self._parser)
+        return _List2007.parse_list_envelope(envelope)
+
+    async def get_many_lists(self, list_names):
+        # type: (List[str]) -> List[Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, str]]]
+        """Run get_list for every name concurrently
+           Results are returned in the same order as list_names
+        """
+        return await asyncio.gather(*(self.get_list(name) for name in list_names))
@@ -6,13 +6,14 @@ from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
 from .request_helper import post
 import requests
 import json
 from lxml import etree
 
-from .soap import Soap
+from .soap import Soap, _ServiceContext, _soap_headers, _xml_parser
 
 # import defusedxml.ElementTree as etree
 
@@ -28,9 +29,9 @@ class _List2007:
         self,
         session,  # type: requests.Session
         list_name,  # type: str
-        url,  # type: Callable[[str], str]
+        services,  # type: Dict[str, _ServiceContext]
         verify_ssl,  # type: bool
-        users,  # type: Optional[Dict]
+        users,  # type: Union[Dict, Callable[[], Dict], None]
         huge_tree,  # type: bool
         timeout,  # type: Optional[int]
         exclude_hidden_fields=False,  # type: bool
@@ -39,10 +40,13 @@ class _List2007:
         # type: (...) -> None
         self._session = session
         self.list_name = list_name
-        self._url = url
+        self._lists_service = services["Lists"]
+        self._views_service = services["Views"]
         self._verify_ssl = verify_ssl
-        self.users = users
+        # users may be a callable so the Site only fetches them when needed
+        self._users = users
         self.huge_tree = huge_tree
+        self._parser = _xml_parser(huge_tree)
         self.timeout = timeout
         self._exclude_hidden_fields = exclude_hidden_fields
         # List Info
@@ -68,13 +72,17 @@ class _List2007:
         self.last_request = None  # type: Optional[str]
         self.date_format = re.compile("[0-9]+-[0-9]+-[0-9]+ [0-9]+:[0-9]+:[0-9]+")
 
-    def _headers(self, soapaction):
-        # type: (str) -> Dict[str,str]
-        headers = {
-            "Content-Type": "text/xml; charset=UTF-8",
-            "SOAPAction": "http://schemas.microsoft.com/sharepoint/soap/" + soapaction,
-        }
-        return headers
+    @property
+    def users(self):
+        # type: () -> Optional[Dict]
+        if callable(self._users):
+            self._users = self._users()
+        return self._users
+
+    @staticmethod
+    def _headers(service, soapaction):
+        # type: (_ServiceContext, str) -> Dict[str,str]
+        return _soap_headers(soapaction, service.soap_action_prefix)
 
     def _mutate_to_internal(self, data):
         # type: (List[Dict]) -> None
@@ -174,7 +182,7 @@ class _List2007:
                     return "0"
                 else:
                     raise Exception("%s not a valid Boolean Value, only 'Yes' or 'No'" % value)
-            elif self.users and field_type == "User":
+            elif field_type == "User" and self.users:
                 return self.users["py"][key]
             else:
                 return value
@@ -257,17 +265,15 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("GetListItems"),
+                        url=self._lists_service.url,
+                        headers=self._headers(self._lists_service, "GetListItems"),
                         data=str(soap_request).encode("utf-8"),
                         verify=self._verify_ssl,
                         timeout=self.timeout)
 
         # Parse Response
         # TODO: Verify if this works with Sharepoint lists with validation
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        envelope = etree.fromstring(response.content, self._parser)
         listitems = envelope[0][0][0][0][0]
         data = []
         for row in listitems:
@@ -295,16 +301,14 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("GetList"),
+                        url=self._lists_service.url,
+                        headers=self._headers(self._lists_service, "GetList"),
                         data=str(soap_request).encode("utf-8"),
                         verify=self._verify_ssl,
                         timeout=self.timeout)
 
         # Parse Response
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))  # type: etree.ElementTree
+        envelope = etree.fromstring(response.content, self._parser)  # type: etree.ElementTree
         (fields, regional_settings, server_settings) = self.parse_list_envelope(envelope)
         self.fields += fields
         self.regional_settings.update(regional_settings)
@@ -363,16 +367,14 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Views"),
-                        headers=self._headers("GetView"),
+                        url=self._views_service.url,
+                        headers=self._headers(self._views_service, "GetView"),
                         data=str(soap_request).encode("utf-8"),
                         verify=self._verify_ssl,
                         timeout=self.timeout)
 
         # Parse Response
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))  # type: etree.ElementTree
+        envelope = etree.fromstring(response.content, self._parser)  # type: etree.ElementTree
         # TODO: Fix me? Should this use XPath too?
         view = envelope[0][0][0][0]
         info = {key: value for (key, value) in view.items()}
@@ -393,15 +395,13 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Views"),
-                        headers=self._headers("GetViewCollection"),
+                        url=self._views_service.url,
+                        headers=self._headers(self._views_service, "GetViewCollection"),
                         data=str(soap_request).encode("utf-8"),
                         verify=self._verify_ssl,
                         timeout=self.timeout)
 
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        envelope = etree.fromstring(response.content, self._parser)
         views = envelope[0][0][0][0]
         data = []
         for row in views.getchildren():
@@ -422,8 +422,8 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("GetVersionCollection"),
+                        url=self._lists_service.url,
+                        headers=self._headers(self._lists_service, "GetVersionCollection"),
                         data=str(soap_request).encode("utf-8"),
                         verify=self._verify_ssl,
                         timeout=self.timeout)
@@ -432,12 +432,11 @@ class _List2007:
         # including whitespaces and special characters, as attribute name
         # for the Version element. To enable successful parsing, we replace
         # the attribute name (which we know anyway) by a constant, e.g. field_name
-        content = response.text
-        content = content.replace("Version {field_name}=\"".format(field_name=field_name), "Version field_name=\"")
+        content = response.content
+        content = content.replace("Version {field_name}=\"".format(field_name=field_name).encode("utf-8"),
+                                  b"Version field_name=\"")
 
-        envelope = etree.fromstring(content.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        envelope = etree.fromstring(content, self._parser)
         versions = envelope[0][0][0][0]
         data = []
         for row in versions.getchildren():
@@ -483,16 +482,14 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("UpdateListItems"),
+                        url=self._lists_service.url,
+                        headers=self._headers(self._lists_service, "UpdateListItems"),
                         data=str(soap_request).encode("utf-8"),
                         verify=self._verify_ssl,
                         timeout=self.timeout)
 
         # Parse Response
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        envelope = etree.fromstring(response.content, self._parser)
         # TODO: Fix me
         results = envelope[0][0][0][0]
         data_out = {}  # type: Dict
@@ -514,16 +511,14 @@ class _List2007:
 
         # Send Request
         response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("GetAttachmentCollection"),
+                        url=self._lists_service.url,
+                        headers=self._headers(self._lists_service, "GetAttachmentCollection"),
                         data=str(soap_request).encode("utf-8"),
                         verify=False,
                         timeout=self.timeout)
 
         # Parse Request
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        envelope = etree.fromstring(response.content, self._parser)
         # TODO: Fix this
         attaches = envelope[0][0][0][0]
         attachments = []
@@ -544,14 +539,14 @@ class _List365(_List2007):
     def __init__(self,
                  session,  # type: requests.Session
                  list_name,  # type: str
-                 url,  # type: Callable[[str], str]
+                 services,  # type: Dict[str, _ServiceContext]
                  verify_ssl,  # type: bool
-                 users,  # type: Optional[Dict]
+                 users,  # type: Union[Dict, Callable[[], Dict], None]
                  huge_tree,  # type: bool
                  timeout,  # type: Optional[int]
                  exclude_hidden_fields=False,  # type: bool
                  site_url=None):
-        super().__init__(session, list_name, url, verify_ssl, users, huge_tree, timeout, exclude_hidden_fields, site_url)
+        super().__init__(session, list_name, services, verify_ssl, users, huge_tree, timeout, exclude_hidden_fields, site_url)
         self.site_url = site_url
         self.schema = self._get_schema()
         self.version = "v365"
@@ -1,22 +1,209 @@
+import io
+import os
+import ssl
+import sys
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
+from types import MappingProxyType
+from xml.parsers import expat
 
 import requests
+from requests.packages.urllib3.util.request import ACCEPT_ENCODING
 from requests.packages.urllib3.util.retry import Retry
 from requests_toolbelt import SSLAdapter
 from lxml import etree
 # import defusedxml.ElementTree as etree
 
+try:
+    import httpx
+except ImportError:  # only needed for transport="httpx"
+    httpx = None
+
+from .errors import ShareplumRequestError
 from .request_helper import get, post
 from .list import _List2007, _List365
 from .folder import _Folder
-from .soap import Soap
+from .soap import SOAP_ACTION_PREFIX, Soap, _ServiceContext, _build_soap, _soap_headers, _xml_parser
 from .version import __version__
 
 from enum import Enum
 
+# Keep-alive pool sizing for the shared Session; every _List created from
+# a Site reuses these connections to the same SharePoint host.
+_POOL_CONNECTIONS = 16
+_POOL_MAXSIZE = 64
+
+_SERVICES_URL = {
+    "Alerts": "/_vti_bin/Alerts.asmx",
+    "Authentication": "/_vti_bin/Authentication.asmx",
+    "Copy": "/_vti_bin/Copy.asmx",
+    "Dws": "/_vti_bin/Dws.asmx",
+    "Forms": "/_vti_bin/Forms.asmx",
+    "Imaging": "/_vti_bin/Imaging.asmx",
+    "DspSts": "/_vti_bin/DspSts.asmx",
+    "Lists": "/_vti_bin/lists.asmx",
+    "Meetings": "/_vti_bin/Meetings.asmx",
+    "People": "/_vti_bin/People.asmx",
+    "Permissions": "/_vti_bin/Permissions.asmx",
+    "SiteData": "/_vti_bin/SiteData.asmx",
+    "Sites": "/_vti_bin/Sites.asmx",
+    "Search": "/_vti_bin/Search.asmx",
+    "UserGroup": "/_vti_bin/usergroup.asmx",
+    "Versions": "/_vti_bin/Versions.asmx",
+    "Views": "/_vti_bin/Views.asmx",
+    "WebPartPages": "/_vti_bin/WebPartPages.asmx",
+    "Webs": "/_vti_bin/Webs.asmx",
+}  # type: Dict[str, str]
+
+# GetListItems returns each item as a <z:row> in the rowset namespace
+_ROW_TAG = "{#RowsetSchema}row"
+# expat with namespace_separator="}" reports the same tag as "#RowsetSchema}row"
+_EXPAT_ROW_TAG = _ROW_TAG[1:]
+# The rows sit in <rs:data>, and a real UserInfo response has one even with no rows
+_DATA_TAG = "{urn:schemas-microsoft-com:rowset}data"
+_EXPAT_DATA_TAG = _DATA_TAG[1:]
+_USERS_PARSE_ERROR = "GetUsers GetListItems response failed to parse correctly: "
+
+_SP_NS_MAP = {"sp": "http://schemas.microsoft.com/sharepoint/soap/"}
+_XP_LISTS = etree.XPath("//sp:_sList", namespaces=_SP_NS_MAP)
+
+
+_TEMPLATE_IDS = MappingProxyType({
+    "Announcements": "104",
+    "Contacts": "105",
+    "Custom List": "100",
+    "Custom List in Datasheet View": "120",
+    "DataSources": "110",
+    "Discussion Board": "108",
+    "Document Library": "101",
+    "Events": "106",
+    "Form Library": "115",
+    "Issues": "1100",
+    "Links": "103",
+    "Picture Library": "109",
+    "Survey": "102",
+    "Tasks": "107",
+})
+
+
+def _template_id(template_id):
+    # type: (Any) -> str
+    """Convert a List Template name or number to its ID"""
+    # Let's automatically convert the different
+    # ways we can select the template_id
+    if isinstance(template_id, int):
+        template_id = str(template_id)
+    elif isinstance(template_id, str) and not template_id.isdigit():
+        template_id = _TEMPLATE_IDS[template_id]
+    return template_id
+
+
+def _parse_users_expat(content):
+    # type: (bytes) -> Dict[str, Dict[str, str]]
+    """Read the user rows with expat, without creating any Elements"""
+    py = {}  # type: Dict[str, str]
+    sp = {}  # type: Dict[str, str]
+    seen_data = False
+
+    def start_element(tag, attrs):
+        # type: (str, Dict[str, str]) -> None
+        nonlocal seen_data
+        if tag == _EXPAT_DATA_TAG:
+            seen_data = True
+        elif tag == _EXPAT_ROW_TAG:
+            _id = attrs.get("ows_ID")
+            name = attrs.get("ows_ImnName")
+            if _id and name:
+                name = sys.intern(name)
+                key = sys.intern(_id + ";#" + name)
+                py[name] = key
+                sp[key] = name
+
+    def start_doctype(*args):
+        # type: (Any) -> None
+        # SOAP messages must not contain a DTD, so never expand its entities
+        raise requests.ConnectionError(_USERS_PARSE_ERROR + "unexpected DTD in SOAP response")
+
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+    parser.StartDoctypeDeclHandler = start_doctype
+    parser.StartElementHandler = start_element
+    parser.Parse(content, True)
+    if not seen_data:
+        raise requests.ConnectionError(_USERS_PARSE_ERROR + "no rs:data element in response")
+    return {"py": py, "sp": sp}
+
+
+def _parse_users(source, huge_tree):
+    # type: (Any, bool) -> Dict[str, Dict[str, str]]
+    """Build the py/sp user lookups from a UserInfo GetListItems response
+       source is a file-like object. Regular responses are read with expat;
+       huge_tree responses, and anything expat rejects, are streamed through
+       lxml so the full UserInfo tree is never built.
+    """
+    if not huge_tree:
+        content = source.read()
+        try:
+            return _parse_users_expat(content)
+        except expat.ExpatError:
+            # lxml can recover from malformed responses
+            source = io.BytesIO(content)
+
+    py = {}  # type: Dict[str, str]
+    sp = {}  # type: Dict[str, str]
+    seen_data = False
+    try:
+        for _event, row in etree.iterparse(source,
+                                           events=("end",),
+                                           tag=(_ROW_TAG, _DATA_TAG),
+                                           huge_tree=huge_tree,
+                                           recover=True,
+                                           resolve_entities=False,
+                                           no_network=True,
+                                           load_dtd=False):
+            if row.tag == _DATA_TAG:
+                seen_data = True
+                continue
+            _id = row.get("ows_ID")
+            name = row.get("ows_ImnName")
+            if _id and name:
+                name = sys.intern(name)
+                key = sys.intern(_id + ";#" + name)
+                py[name] = key
+                sp[key] = name
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+    except Exception as e:
+        raise requests.ConnectionError(_USERS_PARSE_ERROR + str(e))
+
+    if not seen_data:
+        raise requests.ConnectionError(_USERS_PARSE_ERROR + "no rs:data element in response")
+    return {"py": py, "sp": sp}
+
+
+def _status_code(error):
+    # type: (ShareplumRequestError) -> Optional[int]
+    """HTTP status of the response behind a ShareplumRequestError, if any"""
+    response = getattr(error.__context__, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _parse_list_collection(envelope):
+    # type: (etree._Element) -> List[Dict[str, str]]
+    """Read the _sList entries of a GetListCollection response"""
+    data = []
+    for _list in _XP_LISTS(envelope):
+        _list_data = {}
+        for item in _list:
+            _list_data[etree.QName(item).localname] = item.text
+        data.append(_list_data)
+
+    return data
+
 
 # SharePoint Versions
 class Version(Enum):
@@ -29,6 +216,7 @@ class Version(Enum):
 
 
 class _Site2007:
+    _soap_action_prefix = SOAP_ACTION_PREFIX
 
     def __init__(self,
                  site_url,  # type: str
@@ -38,10 +226,23 @@ class _Site2007:
                  ssl_version=None,  # type: Optional[float]
                  huge_tree=False,  # type: bool
                  timeout=None,  # type: Optional[int]
-                 retry=None):
+                 retry=None,
+                 transport="requests"):  # type: str
         self.site_url = site_url
         self._verify_ssl = verify_ssl
 
+        if transport == "httpx":
+            if httpx is None:
+                raise ImportError("transport='httpx' requires httpx, install SharePlum[http2]")
+            # Site SOAP calls skip the requests adapters, so refuse what only they would apply
+            if ssl_version is not None or retry is not None:
+                raise ValueError("ssl_version and retry are not supported with transport='httpx'")
+            if isinstance(auth, requests.auth.AuthBase):
+                raise ValueError("transport='httpx' needs an httpx auth such as a (username, password) tuple, "
+                                 "not %s" % type(auth).__name__)
+        elif transport != "requests":
+            raise ValueError("transport must be 'requests' or 'httpx', not %r" % transport)
+
         if retry is None:
             retry = Retry(total=5,
                         read=5,
@@ -49,17 +250,24 @@ class _Site2007:
                         backoff_factor=0.3,
                         status_forcelist=[500, 502, 503, 504])
 
-        http_adaptor = requests.adapters.HTTPAdapter(max_retries=retry)
+        http_adaptor = requests.adapters.HTTPAdapter(pool_connections=_POOL_CONNECTIONS,
+                                                     pool_maxsize=_POOL_MAXSIZE,
+                                                     max_retries=retry)
         https_adaptor = http_adaptor
 
         self._session = requests.Session()
         if ssl_version is not None:
-            https_adaptor = SSLAdapter(ssl_version, max_retries=retry)
+            https_adaptor = SSLAdapter(ssl_version,
+                                       pool_connections=_POOL_CONNECTIONS,
+                                       pool_maxsize=_POOL_MAXSIZE,
+                                       max_retries=retry)
 
         self._session.mount("https://", https_adaptor)
         self._session.mount("http://", http_adaptor)
 
-        self._session.headers.update({"user-agent": "shareplum/%s" % __version__})
+        # ACCEPT_ENCODING adds br when brotli is installed for urllib3 to decode
+        self._session.headers.update({"user-agent": "shareplum/%s" % __version__,
+                                      "Accept-Encoding": ACCEPT_ENCODING})
 
         if authcookie is not None:
             self._session.cookies = authcookie
@@ -67,49 +275,99 @@ class _Site2007:
             self._session.auth = auth
 
         self.huge_tree = huge_tree
+        # One parser per Site. lxml serialises concurrent parses on a shared
+        # parser, so threads sharing a Site will queue here.
+        self._parser = _xml_parser(huge_tree)
 
         self.timeout = timeout
 
-        self.last_request = None  # type: Optional[str]
-
-        self._services_url = {
-            "Alerts": "/_vti_bin/Alerts.asmx",
-            "Authentication": "/_vti_bin/Authentication.asmx",
-            "Copy": "/_vti_bin/Copy.asmx",
-            "Dws": "/_vti_bin/Dws.asmx",
-            "Forms": "/_vti_bin/Forms.asmx",
-            "Imaging": "/_vti_bin/Imaging.asmx",
-            "DspSts": "/_vti_bin/DspSts.asmx",
-            "Lists": "/_vti_bin/lists.asmx",
-            "Meetings": "/_vti_bin/Meetings.asmx",
-            "People": "/_vti_bin/People.asmx",
-            "Permissions": "/_vti_bin/Permissions.asmx",
-            "SiteData": "/_vti_bin/SiteData.asmx",
-            "Sites": "/_vti_bin/Sites.asmx",
-            "Search": "/_vti_bin/Search.asmx",
-            "UserGroup": "/_vti_bin/usergroup.asmx",
-            "Versions": "/_vti_bin/Versions.asmx",
-            "Views": "/_vti_bin/Views.asmx",
-            "WebPartPages": "/_vti_bin/WebPartPages.asmx",
-            "Webs": "/_vti_bin/Webs.asmx",
-        }  # type: Dict[str, str]
+        # SOAP calls can go over HTTP/2 instead, multiplexed on one connection
+        self._client = None  # type: Optional[Any]
+        if transport == "httpx":
+            # requests takes a CA bundle path for verify, httpx wants an SSLContext
+            verify = verify_ssl  # type: Any
+            if isinstance(verify_ssl, str):
+                if os.path.isdir(verify_ssl):
+                    verify = ssl.create_default_context(capath=verify_ssl)
+                else:
+                    verify = ssl.create_default_context(cafile=verify_ssl)
+            self._client = httpx.Client(http2=True,
+                                        verify=verify,
+                                        timeout=timeout,
+                                        limits=httpx.Limits(max_connections=_POOL_MAXSIZE,
+                                                            max_keepalive_connections=_POOL_MAXSIZE),
+                                        headers={"user-agent": "shareplum/%s" % __version__},
+                                        cookies=authcookie,
+                                        auth=auth if authcookie is None else None)
+
+        self.last_request = None  # type: Optional[bytes]
+
+        self._services_url = _SERVICES_URL
+        self._svc = {
+            name: _ServiceContext(site_url + path, self._soap_action_prefix)
+            for name, path in self._services_url.items()
+        }  # type: Dict[str, _ServiceContext]
+
+        self._users = None  # type: Optional[Dict[str, Dict[str, str]]]
+        # (ETag, lists) of the last GetListCollection response
+        self._list_collection_cache = None  # type: Optional[Tuple[str, Tuple[Dict[str, str], ...]]]
+        # Cleared once the server answers If-None-Match on POST with 412
+        self._conditional_list_collection = True
 
         self.site_info = self.get_site()
-        self.users = self.get_users()
         self.version = "2007"  # For Debugging
 
-    def _url(self, service):
-        # type: (str) -> str
-        """Full SharePoint Service URL"""
-        return "".join([self.site_url, self._services_url[service]])
+    def close(self):
+        # type: () -> None
+        """Close the connections held by this Site and the Lists it created"""
+        self._session.close()
+        if self._client is not None:
+            self._client.close()
+
+    @property
+    def users(self):
+        # type: () -> Dict[str, Dict[str, str]]
+        """Site users, fetched on first use"""
+        if self._users is None:
+            self._users = self.get_users()
+        return self._users
+
+    @users.setter
+    def users(self, users):
+        # type: (Optional[Dict[str, Dict[str, str]]]) -> None
+        self._users = users
 
     def _headers(self, soap_action):
         # type: (str) -> Dict[str, str]
-        headers = {
-            "Content-Type": "text/xml; charset=UTF-8",
-            "SOAPAction": "http://schemas.microsoft.com/sharepoint/soap/" + soap_action,
-        }
-        return headers
+        return _soap_headers(soap_action, self._soap_action_prefix)
+
+    def _post(self, service, soap_action, body, stream=False, headers=None):
+        # type: (str, str, bytes, bool, Optional[Dict[str, str]]) -> Any
+        """Send an encoded SOAP request to a Site service"""
+        self.last_request = body
+        soap_headers = self._headers(soap_action)
+        if headers:
+            soap_headers.update(headers)
+        if self._client is not None:
+            try:
+                response = self._client.post(self._svc[service].url,
+                                             headers=soap_headers,
+                                             content=body,
+                                             timeout=self.timeout)
+                if response.is_error:
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPError as err:
+                raise ShareplumRequestError("Shareplum HTTP Post Failed", err)
+
+        # Session already supplies user-agent, Accept-Encoding and auth
+        return post(self._session,
+                    url=self._svc[service].url,
+                    headers=soap_headers,
+                    data=body,
+                    stream=stream,
+                    verify=self._verify_ssl,
+                    timeout=self.timeout)
 
     # This is part of List but seems awkward under the List Method
     def add_list(self, list_name, description, template_id):
@@ -132,85 +390,44 @@ class _Site2007:
                Survey
                Tasks
         """
-        template_ids = {
-            "Announcements": "104",
-            "Contacts": "105",
-            "Custom List": "100",
-            "Custom List in Datasheet View": "120",
-            "DataSources": "110",
-            "Discussion Board": "108",
-            "Document Library": "101",
-            "Events": "106",
-            "Form Library": "115",
-            "Issues": "1100",
-            "Links": "103",
-            "Picture Library": "109",
-            "Survey": "102",
-            "Tasks": "107",
-        }
-
-        # Let's automatically convert the different
-        # ways we can select the template_id
-        if type(template_id) == int:
-            template_id = str(template_id)
-        elif type(template_id) == str:
-            if template_id.isdigit():
-                pass
-            else:
-                template_id = template_ids[template_id]
+        template_id = _template_id(template_id)
 
         # Build Request
-        soap_request = Soap("AddList")
-        soap_request.add_parameter("listName", list_name)
-        soap_request.add_parameter("description", description)
-        soap_request.add_parameter("templateID", template_id)
-        self.last_request = str(soap_request)
+        body = _build_soap("AddList",
+                           listName=list_name,
+                           description=description,
+                           templateID=template_id)
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("AddList"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
+        response = self._post("Lists", "AddList", body)
+        self.invalidate_list_collection()
 
         return response.text
 
     def delete_list(self, list_name):
-        # type: (str) -> Optional[str]
+        # type: (str) -> str
         """Delete a List with given name"""
 
         # Build Request
-        soap_request = Soap("DeleteList")
-        soap_request.add_parameter("listName", list_name)
-        self.last_request = str(soap_request)
+        body = _build_soap("DeleteList", listName=list_name)
 
         # Send Request
-        post(self._session,
-             url=self._url("Lists"),
-             headers=self._headers("DeleteList"),
-             data=str(soap_request).encode("utf-8"),
-             verify=self._verify_ssl,
-             timeout=self.timeout)
+        response = self._post("Lists", "DeleteList", body)
+        self.invalidate_list_collection()
+
+        return response.text
 
     def get_form_collection(self, list_name):
 
         # Build Request
         soap_request = Soap("GetFormCollection")
         soap_request.add_parameter("listName", list_name)
-        self.last_request = str(soap_request)
+        body = str(soap_request).encode("utf-8")
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("Forms"),
-                        headers=self._headers("GetFormCollection"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
-
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        response = self._post("Forms", "GetFormCollection", body)
+
+        envelope = etree.fromstring(response.content, self._parser)
         items = envelope[0][0][0][0]
         data = []
         for _item in items:
@@ -221,21 +438,12 @@ class _Site2007:
     def get_site(self):
 
         # Build Request
-        soap_request = Soap("GetSite")
-        soap_request.add_parameter("SiteUrl", self.site_url)
-        self.last_request = str(soap_request)
+        body = _build_soap("GetSite", SiteUrl=self.site_url)
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("Sites"),
-                        headers=self._headers("GetSite"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
-
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        response = self._post("Sites", "GetSite", body)
+
+        envelope = etree.fromstring(response.content, self._parser)
         data = envelope[0][0][0]
 
         # TODO: Not sure what to do with this, so just return the text
@@ -246,19 +454,12 @@ class _Site2007:
         # Build Request
         soap_request = Soap("GetListTemplates")
         soap_request.add_parameter("GetListTemplates")
-        self.last_request = str(soap_request)
+        body = str(soap_request).encode("utf-8")
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("Webs"),
-                        headers=self._headers("GetListTemplates"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
-
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        response = self._post("Webs", "GetListTemplates", body)
+
+        envelope = etree.fromstring(response.content, self._parser)
         lists = envelope[0][0][0][0]
         data = []
         for _list in lists:
@@ -271,20 +472,13 @@ class _Site2007:
         # Build Request
         soap_request = Soap("GetSiteTemplates")
         soap_request.add_parameter("LCID", lcid)
-        self.last_request = str(soap_request)
+        body = str(soap_request).encode("utf-8")
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("Sites"),
-                        headers=self._headers("GetSiteTemplates"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
+        response = self._post("Sites", "GetSiteTemplates", body)
 
         return response
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
+        envelope = etree.fromstring(response.content, self._parser)
         lists = envelope[0][0][1]
         data = []
         for _list in lists:
@@ -296,33 +490,46 @@ class _Site2007:
         # type: () -> Optional[List[Dict[str, str]]]
         """Returns List information for current Site"""
         # Build Request
-        soap_request = Soap("GetListCollection")
-        self.last_request = str(soap_request)
+        body = _build_soap("GetListCollection")
+
+        # Ask the server to skip the body if nothing changed since last time.
+        # If-Modified-Since is ignored on POST, so only the ETag is sent.
+        headers = {}
+        cache = self._list_collection_cache
+        if cache is not None and self._conditional_list_collection:
+            headers["If-None-Match"] = cache[0]
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("SiteData"),
-                        headers=self._headers("GetListCollection"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
-
-        envelope = etree.fromstring(response.text.encode("utf-8"),
-                                    parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                    recover=True))
-        # TODO: Verify if this works on Sharepoint lists with validation
-        lists = envelope[0][0][1]
-        data = []
-        for _list in lists:
-            _list_data = {}
-            for item in _list:
-                key = item.tag.replace("{http://schemas.microsoft.com/sharepoint/soap/}", "")
-                value = item.text
-                _list_data[key] = value
-            data.append(_list_data)
+        try:
+            response = self._post("SiteData", "GetListCollection", body, headers=headers)
+        except ShareplumRequestError as err:
+            # RFC 9110 servers answer a matching If-None-Match on POST with
+            # 412 rather than 304, so stop asking and fetch the lists again
+            if not headers or _status_code(err) != 412:
+                raise
+            self._list_collection_cache = None
+            self._conditional_list_collection = False
+            response = self._post("SiteData", "GetListCollection", body)
+        if response.status_code == 304 and cache is not None:
+            return [dict(_list_data) for _list_data in cache[1]]
+
+        envelope = etree.fromstring(response.content, self._parser)
+        data = _parse_list_collection(envelope)
+
+        etag = response.headers.get("ETag")
+        if etag and self._conditional_list_collection:
+            # Keep a private copy so callers can't change what a 304 returns
+            self._list_collection_cache = (etag, tuple(dict(_list_data) for _list_data in data))
+        else:
+            self._list_collection_cache = None
 
         return data
 
+    def invalidate_list_collection(self):
+        # type: () -> None
+        """Forget the cached get_list_collection result"""
+        self._list_collection_cache = None
+
     def get_users(self, rowlimit=0):
         # type: (int) -> Optional[Dict[str, Dict[str, str]]]
         """Get Items from current list
@@ -330,39 +537,20 @@ class _Site2007:
         """
 
         # Build Request
-        soap_request = Soap("GetListItems")
-        soap_request.add_parameter("listName", "UserInfo")
-
-        # Set Row Limit
-        soap_request.add_parameter("rowLimit", str(rowlimit))
-        self.last_request = str(soap_request)
+        body = _build_soap("GetListItems", listName="UserInfo", rowLimit=str(rowlimit))
 
         # Send Request
-        response = post(self._session,
-                        url=self._url("Lists"),
-                        headers=self._headers("GetListItems"),
-                        data=str(soap_request).encode("utf-8"),
-                        verify=self._verify_ssl,
-                        timeout=self.timeout)
+        response = self._post("Lists", "GetListItems", body, stream=True)
 
         # Parse Response
-        try:
-            envelope = etree.fromstring(response.text.encode("utf-8"),
-                                        parser=etree.XMLParser(huge_tree=self.huge_tree,
-                                        recover=True))
-        except Exception as e:
-            raise requests.ConnectionError("GetUsers GetListItems response failed to parse correctly: " + str(e))
-        # TODO: Verify if this works on Sharepoint lists with validation
-        listitems = envelope[0][0][0][0][0]
-        data = []
-        for row in listitems:
-            # Strip the 'ows_' from the beginning with key[4:]
-            data.append({key[4:]: value for (key, value) in row.items() if key[4:]})
+        if self._client is not None:
+            return _parse_users(io.BytesIO(response.content), self.huge_tree)
 
-        return {
-            "py": {i["ImnName"]: i["ID"] + ";#" + i["ImnName"] for i in data},
-            "sp": {i["ID"] + ";#" + i["ImnName"]: i["ImnName"] for i in data},
-        }
+        response.raw.decode_content = True
+        try:
+            return _parse_users(response.raw, self.huge_tree)
+        finally:
+            response.close()
 
     # SharePoint Method Objects
     # Not the best name as it could clash with the built-in list()
@@ -377,9 +565,9 @@ class _Site2007:
         return _List2007(
             self._session,
             list_name,
-            self._url,
+            self._svc,
             self._verify_ssl,
-            self.users,
+            lambda: self.users,
             self.huge_tree,
             self.timeout,
             exclude_hidden_fields=exclude_hidden_fields,
@@ -402,8 +590,10 @@ class _Site365(_Site2007):
                  verify_ssl=True,  # type: bool
                  ssl_version=None,  # type: Optional[float]
                  huge_tree=False,  # type: bool
-                 timeout=None):  # type: Optional[int]
-        super().__init__(site_url, auth, authcookie, verify_ssl, ssl_version, huge_tree, timeout)
+                 timeout=None,  # type: Optional[int]
+                 transport="requests"):  # type: str
+        super().__init__(site_url, auth, authcookie, verify_ssl, ssl_version, huge_tree, timeout,
+                         transport=transport)
 
         self._session.headers.update({'Accept': 'application/json',
                                       'Content-Type': 'application/json;odata=nometadata'})
@@ -494,9 +684,9 @@ class _Site365(_Site2007):
         return _List365(
             self._session,
             list_name,
-            self._url,
+            self._svc,
             self._verify_ssl,
-            self.users,
+            lambda: self.users,
             self.huge_tree,
             self.timeout,
             exclude_hidden_fields=exclude_hidden_fields,
@@ -514,7 +704,8 @@ def Site(site_url,  # type: str
          verify_ssl=True,  # type: bool
          ssl_version=None,  # type: Optional[float]
          huge_tree=False,  # type: bool
-         timeout=None):  # type: Optional[int]
+         timeout=None,  # type: Optional[int]
+         transport="requests"):  # type: str
 
     # We ask for the various versions of SharePoint with 2010 as default
     # Multiple Version are allowed, but only 2010, 2013, and 365 are implemented
@@ -525,7 +716,8 @@ def Site(site_url,  # type: str
                          verify_ssl,
                          ssl_version,
                          huge_tree,
-                         timeout)
+                         timeout,
+                         transport=transport)
 
     elif version == Version.v2010:
         return _Site2007(site_url,
@@ -534,7 +726,8 @@ def Site(site_url,  # type: str
                          verify_ssl,
                          ssl_version,
                          huge_tree,
-                         timeout)
+                         timeout,
+                         transport=transport)
 
     elif version == Version.v2013:
         return _Site365(site_url,
@@ -543,7 +736,8 @@ def Site(site_url,  # type: str
                         verify_ssl,
                         ssl_version,
                         huge_tree,
-                        timeout)
+                        timeout,
+                        transport=transport)
 
     elif version == Version.v2016:
         return _Site365(site_url,
@@ -552,7 +746,8 @@ def Site(site_url,  # type: str
                         verify_ssl,
                         ssl_version,
                         huge_tree,
-                        timeout)
+                        timeout,
+                        transport=transport)
 
     elif version == Version.v2019:
         return _Site365(site_url,
@@ -561,7 +756,8 @@ def Site(site_url,  # type: str
                         verify_ssl,
                         ssl_version,
                         huge_tree,
-                        timeout)
+                        timeout,
+                        transport=transport)
 
     elif version == Version.v365:
         return _Site365(site_url,
@@ -570,4 +766,5 @@ def Site(site_url,  # type: str
                         verify_ssl,
                         ssl_version,
                         huge_tree,
-                        timeout)
+                        timeout,
+                        transport=transport)
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import pytest
+from lxml import etree
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from shareplum.async_site import AsyncSite  # noqa: E402
+from shareplum.errors import ShareplumRequestError  # noqa: E402
+from shareplum.list import _List2007  # noqa: E402
+
+__location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+LIST_COLLECTION = (b'<?xml version="1.0" encoding="utf-8"?>'
+                   b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+                   b'<GetListCollectionResponse xmlns="http://schemas.microsoft.com/sharepoint/soap/">'
+                   b'<GetListCollectionResult>0</GetListCollectionResult><vLists>'
+                   b'<_sList><Title>Tasks</Title><InternalName>{ABC}</InternalName></_sList>'
+                   b'</vLists></GetListCollectionResponse></soap:Body></soap:Envelope>')
+
+
+def _data(name):
+    with open(os.path.join(__location__, "data", name), "rb") as f:
+        return f.read()
+
+
+def _run(handler, test):
+    """Serve handler on a local port and await test(site_url)"""
+    async def main():
+        app = web.Application()
+        app.router.add_route("POST", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        server = web.TCPSite(runner, "127.0.0.1", 0)
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            return await test("http://127.0.0.1:%d/sites/test" % port)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+async def _soap_handler(request):
+    action = request.headers["SOAPAction"].rsplit("/", 1)[-1]
+    body = await request.read()
+    if action == "GetListCollection":
+        return web.Response(body=LIST_COLLECTION)
+    if action == "GetListItems":
+        return web.Response(body=_data("userinfo.xml"))
+    if action == "GetList":
+        name = "2010xml.xml" if b"<ns1:listName>Old</ns1:listName>" in body else "validation.xml"
+        return web.Response(body=_data(name))
+    return web.Response(body=b"<ok/>")
+
+
+def _fields(name):
+    envelope = etree.fromstring(_data(name), etree.XMLParser(huge_tree=True, recover=True))
+    return _List2007.parse_list_envelope(envelope)
+
+
+def test_get_list_collection_and_users():
+    async def test(url):
+        async with AsyncSite(url) as site:
+            return await site.get_list_collection(), await site.get_users()
+
+    lists, users = _run(_soap_handler, test)
+    assert lists == [{"Title": "Tasks", "InternalName": "{ABC}"}]
+    assert users["py"]["Jane Doe"] == "1;#Jane Doe"
+
+
+def test_get_many_lists_keeps_order():
+    async def test(url):
+        async with AsyncSite(url) as site:
+            return await site.get_many_lists(["New", "Old", "New"])
+
+    results = _run(_soap_handler, test)
+    assert results == [_fields("validation.xml"), _fields("2010xml.xml"), _fields("validation.xml")]
+
+
+def test_post_wraps_http_errors():
+    async def handler(request):
+        return web.Response(status=500)
+
+    async def test(url):
+        async with AsyncSite(url) as site:
+            with pytest.raises(ShareplumRequestError):
+                await site.delete_list("Tasks")
+            return site.last_request
+
+    assert b"<ns1:listName>Tasks</ns1:listName>" in _run(handler, test)
+
+
+def test_post_wraps_timeouts():
+    async def handler(request):
+        await asyncio.sleep(0.5)
+        return web.Response(body=b"<ok/>")
+
+    async def test(url):
+        async with AsyncSite(url, timeout=0.2) as site:
+            with pytest.raises(ShareplumRequestError):
+                await site.delete_list("Tasks")
+
+    _run(handler, test)
+
+
+def test_session_lifecycle():
+    async def test(url):
+        site = AsyncSite(url)
+        assert site._session is None
+        await site.add_list("Tasks", "", "Tasks")
+        session = site._session
+        await site.delete_list("Tasks")
+        assert site._session is session
+        await site.close()
+        assert site._session is None and session.closed
+        # a closed site opens a new session when used again
+        async with site:
+            await site.get_list_collection()
+            assert site._session is not session
+        assert site._session is None
+
+    _run(_soap_handler, test)
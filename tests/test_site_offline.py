@@ -0,0 +1,218 @@
+import os
+import threading
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import certifi
+import pytest
+import requests
+from requests.auth import HTTPBasicAuth
+from requests.packages.urllib3.util.retry import Retry
+from shareplum import Site
+from shareplum.site import _Site2007
+
+GET_SITE = (b'<?xml version="1.0" encoding="utf-8"?>'
+            b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+            b'<GetSiteResponse xmlns="http://schemas.microsoft.com/sharepoint/soap/">'
+            b'<GetSiteResult>site</GetSiteResult></GetSiteResponse></soap:Body></soap:Envelope>')
+
+LIST_COLLECTION = (b'<?xml version="1.0" encoding="utf-8"?>'
+                   b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+                   b'<GetListCollectionResponse xmlns="http://schemas.microsoft.com/sharepoint/soap/">'
+                   b'<GetListCollectionResult>0</GetListCollectionResult><vLists>'
+                   b'<_sList><Title>Tasks</Title></_sList><_sList><Title>Issues</Title></_sList>'
+                   b'</vLists></GetListCollectionResponse></soap:Body></soap:Envelope>')
+LISTS = [{"Title": "Tasks"}, {"Title": "Issues"}]
+
+VIEW_COLLECTION = (b'<?xml version="1.0" encoding="utf-8"?>'
+                   b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+                   b'<GetViewCollectionResponse xmlns="http://schemas.microsoft.com/sharepoint/soap/">'
+                   b'<GetViewCollectionResult><Views><View Name="{1}" DisplayName="All Items"/></Views>'
+                   b'</GetViewCollectionResult></GetViewCollectionResponse></soap:Body></soap:Envelope>')
+
+__location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+
+def _data(name):
+    with open(os.path.join(__location__, "data", name), "rb") as f:
+        return f.read()
+
+
+class SharePoint(BaseHTTPRequestHandler):
+    """Answers every SOAP call with the body registered for its SOAPAction"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        action = self.headers["SOAPAction"].rsplit("/", 1)[-1]
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((action, dict(self.headers)))
+        status, headers, body = self.server.responses.get(action, (200, {}, GET_SITE))
+        if "ETag" in headers and self.headers.get("If-None-Match") == headers["ETag"]:
+            status, body = self.server.not_modified, b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SharePoint)
+    httpd.requests = []
+    httpd.responses = {}
+    # SharePoint answers a matching If-None-Match with 304, RFC 9110 says 412 for POST
+    httpd.not_modified = 304
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    httpd.site_url = "http://127.0.0.1:%d/sites/test" % httpd.server_port
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_post_uses_current_timeout(server, monkeypatch):
+    site = Site(server.site_url, timeout=5)
+    sent = []
+    session_post = requests.Session.post
+    monkeypatch.setattr(requests.Session, "post",
+                        lambda self, url, **kwargs: sent.append(kwargs) or session_post(self, url, **kwargs))
+
+    site.timeout = 30
+    site.get_site()
+    assert sent[-1]["timeout"] == 30
+
+
+def test_httpx_rejects_requests_only_arguments(server):
+    pytest.importorskip("httpx")
+    with pytest.raises(ValueError):
+        Site(server.site_url, ssl_version=2, transport="httpx")
+    with pytest.raises(ValueError):
+        _Site2007(server.site_url, retry=Retry(total=1), transport="httpx")
+    with pytest.raises(ValueError):
+        Site(server.site_url, auth=HTTPBasicAuth("user", "password"), transport="httpx")
+    assert server.requests == []
+
+
+def test_httpx_close(server):
+    pytest.importorskip("httpx")
+    site = Site(server.site_url, auth=("user", "password"), transport="httpx")
+    assert server.requests[-1][1]["Authorization"].startswith("Basic ")
+    site.close()
+    assert site._client.is_closed
+    with pytest.raises(RuntimeError):
+        site.get_site()
+
+
+def test_httpx_ca_bundle(server):
+    pytest.importorskip("httpx")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for path in (certifi.where(), os.path.dirname(certifi.where())):
+            Site(server.site_url, verify_ssl=path, transport="httpx").close()
+
+
+def _conditional(server):
+    """If-None-Match sent with each GetListCollection request"""
+    return [headers.get("If-None-Match") for action, headers in server.requests if action == "GetListCollection"]
+
+
+def test_list_collection_not_modified(server):
+    server.responses["GetListCollection"] = (200, {"ETag": '"1"'}, LIST_COLLECTION)
+    site = Site(server.site_url)
+
+    first = site.get_list_collection()
+    first[0]["Title"] = "Changed"
+    first.pop()
+    second = site.get_list_collection()
+    assert second == LISTS
+    second.sort(key=lambda d: d["Title"])
+    second[0].clear()
+    assert site.get_list_collection() == LISTS
+    assert _conditional(server) == [None, '"1"', '"1"']
+
+
+def test_list_collection_without_validators(server):
+    server.responses["GetListCollection"] = (200, {"ETag": '"1"'}, LIST_COLLECTION)
+    site = Site(server.site_url)
+    site.get_list_collection()
+
+    server.responses["GetListCollection"] = (200, {}, LIST_COLLECTION)
+    assert site.get_list_collection() == LISTS
+    assert site._list_collection_cache is None
+    assert site.get_list_collection() == LISTS
+    assert _conditional(server) == [None, '"1"', None]
+
+
+@pytest.mark.parametrize("transport", ["requests", "httpx"])
+def test_list_collection_precondition_failed(server, transport):
+    if transport == "httpx":
+        pytest.importorskip("httpx")
+    server.responses["GetListCollection"] = (200, {"ETag": '"1"'}, LIST_COLLECTION)
+    server.not_modified = 412
+    site = Site(server.site_url, transport=transport)
+
+    assert site.get_list_collection() == LISTS
+    assert site.get_list_collection() == LISTS
+    assert site.get_list_collection() == LISTS
+    assert _conditional(server) == [None, '"1"', None, None]
+
+
+def test_list_collection_ignores_last_modified(server):
+    server.responses["GetListCollection"] = (200, {"Last-Modified": "Mon, 12 Oct 2026 10:00:00 GMT"}, LIST_COLLECTION)
+    site = Site(server.site_url)
+
+    site.get_list_collection()
+    assert site._list_collection_cache is None
+    site.get_list_collection()
+    assert [headers.get("If-Modified-Since") for action, headers in server.requests] == [None] * 3
+
+
+def test_list_collection_invalidated_by_list_changes(server):
+    server.responses["GetListCollection"] = (200, {"ETag": '"1"'}, LIST_COLLECTION)
+    site = Site(server.site_url)
+
+    site.get_list_collection()
+    site.add_list("Events", "", "Events")
+    site.get_list_collection()
+    site.delete_list("Events")
+    site.get_list_collection()
+    assert _conditional(server) == [None, None, None]
+
+
+def _actions(server):
+    return [action for action, headers in server.requests]
+
+
+def test_users_fetched_on_first_user_field(server):
+    server.responses["GetList"] = (200, {}, _data("validation.xml"))
+    server.responses["GetViewCollection"] = (200, {}, VIEW_COLLECTION)
+    server.responses["GetListItems"] = (200, {}, _data("userinfo.xml"))
+
+    site = Site(server.site_url)
+    assert _actions(server) == ["GetSite"]
+    tasks = site.list("Tasks")
+    issues = site.list("Issues")
+    assert _actions(server) == ["GetSite", "GetList", "GetViewCollection", "GetList", "GetViewCollection"]
+
+    assert tasks._python_type("Author", "1;#Jane Doe") == "Jane Doe"
+    assert tasks._python_type("Editor", "7;#Jörg Müller") == "Jörg Müller"
+    assert issues._python_type("Author", "1;#Jane Doe") == "Jane Doe"
+    assert _actions(server).count("GetListItems") == 1
+
+
+def test_users_can_be_assigned(server):
+    server.responses["GetList"] = (200, {}, _data("validation.xml"))
+    server.responses["GetViewCollection"] = (200, {}, VIEW_COLLECTION)
+    users = {"py": {"Someone": "3;#Someone"}, "sp": {"3;#Someone": "Someone"}}
+
+    site = Site(server.site_url)
+    site.users = users
+    assert site.users is users
+    assert site.list("Tasks")._python_type("Author", "3;#Someone") == "Someone"
+    assert "GetListItems" not in _actions(server)
@@ -0,0 +1,51 @@
+import io
+import os
+import pytest
+import requests
+from shareplum.site import _parse_users
+
+__location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+USERS = {
+    "py": {"Jane Doe": "1;#Jane Doe", "Jörg Müller": "7;#Jörg Müller"},
+    "sp": {"1;#Jane Doe": "Jane Doe", "7;#Jörg Müller": "Jörg Müller"},
+}
+
+
+def _userinfo():
+    with open(os.path.join(__location__, "data", "userinfo.xml"), "rb") as f:
+        return f.read()
+
+
+def test_parse_users():
+    assert _parse_users(io.BytesIO(_userinfo()), huge_tree=False) == USERS
+
+
+def test_parse_users_huge_tree():
+    assert _parse_users(io.BytesIO(_userinfo()), huge_tree=True) == USERS
+
+
+def test_parse_users_recovers_from_bad_xml():
+    # Unescaped ampersands make expat give up, so lxml has to recover
+    xml = _userinfo().replace(b"ows_Title=\"Jane Doe\"", b"ows_Title=\"Jane & Co\"")
+    assert _parse_users(io.BytesIO(xml), huge_tree=False) == USERS
+
+
+def test_parse_users_rejects_dtd():
+    xml = _userinfo().replace(b"?>", b'?><!DOCTYPE soap:Envelope [<!ENTITY a "Jane Doe">]>', 1)
+    with pytest.raises(requests.ConnectionError):
+        _parse_users(io.BytesIO(xml), huge_tree=False)
+
+
+def test_parse_users_rejects_non_soap():
+    # e.g. a login page served with 200 instead of the UserInfo rows
+    for content in (b"<html>login</html>", b"<html><body>Sign in</body>", b"Service Unavailable"):
+        for huge_tree in (False, True):
+            with pytest.raises(requests.ConnectionError):
+                _parse_users(io.BytesIO(content), huge_tree=huge_tree)
+
+
+def test_parse_users_without_rows():
+    xml = b'<rs:data xmlns:rs="urn:schemas-microsoft-com:rowset" ItemCount="0"/>'
+    assert _parse_users(io.BytesIO(xml), huge_tree=False) == {"py": {}, "sp": {}}
+    assert _parse_users(io.BytesIO(xml), huge_tree=True) == {"py": {}, "sp": {}}
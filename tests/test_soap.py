@@ -0,0 +1,44 @@
+import pytest
+from lxml import etree
+from shareplum.soap import Soap, _build_soap
+
+
+def _elements(xml):
+    return [(el.tag, (el.text or "").strip()) for el in etree.fromstring(xml).iter()]
+
+
+def test_templates_match_soap():
+    soap_request = Soap("AddList")
+    soap_request.add_parameter("listName", "Tom & Jerry's <List>")
+    soap_request.add_parameter("description", "")
+    soap_request.add_parameter("templateID", "100")
+    body = _build_soap("AddList", listName="Tom & Jerry's <List>", description="", templateID="100")
+    assert _elements(body) == _elements(str(soap_request).encode("utf-8"))
+
+    soap_request = Soap("GetListItems")
+    soap_request.add_parameter("listName", "UserInfo")
+    soap_request.add_parameter("rowLimit", "0")
+    body = _build_soap("GetListItems", listName="UserInfo", rowLimit="0")
+    assert _elements(body) == _elements(str(soap_request).encode("utf-8"))
+
+    body = _build_soap("GetListCollection")
+    assert _elements(body) == _elements(str(Soap("GetListCollection")).encode("utf-8"))
+
+
+def test_templates_reject_what_soap_rejects():
+    for value in ("a\x01b", "a\x00b", "\ud800"):
+        with pytest.raises(ValueError):
+            Soap("DeleteList").add_parameter("listName", value)
+        with pytest.raises(ValueError):
+            _build_soap("DeleteList", listName=value)
+
+    with pytest.raises(TypeError):
+        _build_soap("DeleteList", listName=5)
+
+    # None leaves the element empty, as Soap.add_parameter does
+    body = _build_soap("AddList", listName="Tasks", description=None, templateID="107")
+    soap_request = Soap("AddList")
+    soap_request.add_parameter("listName", "Tasks")
+    soap_request.add_parameter("description", None)
+    soap_request.add_parameter("templateID", "107")
+    assert _elements(body) == _elements(str(soap_request).encode("utf-8"))